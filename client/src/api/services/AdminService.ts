@@ -53,12 +53,12 @@ const AdminService = {
 
   async getDoctors(): Promise<User[]> {
     const response = await httpClient.get(`${API_BASE_URL}/users/doctors/`);
-    return response.data;
+    return response.data.results || response.data;
   },
 
   async getPatients(): Promise<User[]> {
     const response = await httpClient.get(`${API_BASE_URL}/users/patients/`);
-    return response.data;
+    return response.data.results || response.data;
   },
 
   // ==================== COLLECTIONS ====================
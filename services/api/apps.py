@@ -29,10 +29,12 @@ class ApiConfig(AppConfig):
     def ready(self):
         """Application setup once API app is ready.
 
-        1. Register message bus configuration in BusRegistry for webserver processes
+        1. Connect the signal handlers
+        2. Register message bus configuration in BusRegistry for webserver processes
         """
         from django.conf import settings
 
+        from api import signals  # noqa: F401
         from api.events.bus_registry import BusRegistry
 
         # Register message bus configuration for webserver processes
@@ -0,0 +1,27 @@
+from django.urls import path
+
+from api.views import (
+    change_password,
+    confirm_otp_setup,
+    login,
+    logout,
+    me,
+    register,
+    setup_otp,
+    update_profile,
+    verify_otp,
+)
+
+# Authentication endpoints (session-based with OTP), mounted under auth/
+urlpatterns = [
+    path("register/", register, name="auth-register"),
+    path("login/", login, name="auth-login"),
+    path("logout/", logout, name="auth-logout"),
+    path("me/", me, name="auth-me"),
+    path("profile/", update_profile, name="auth-profile"),
+    path("change-password/", change_password, name="auth-change-password"),
+    # OTP endpoints
+    path("verify-otp/", verify_otp, name="auth-verify-otp"),
+    path("setup-otp/", setup_otp, name="auth-setup-otp"),
+    path("confirm-otp-setup/", confirm_otp_setup, name="auth-confirm-otp-setup"),
+]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 - Split migration: ChatMessage room index
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Migration 10: ChatMessage room index
+
+    Adds a composite index on (room, -created_at) so "latest N messages
+    in a room" lookups use an index scan instead of sorting the room.
+    """
+
+    dependencies = [
+        ("api", "0009_knowledge_bases_m2m"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=models.Index(fields=["room", "-created_at"], name="chatmessage_room_recent_idx"),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 - Split migration: ChatMessage audio size
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Migration 11: ChatMessage audio size
+
+    Stores the size of uploaded audio so cleanup can total freed space
+    in SQL instead of querying storage for every file.
+    """
+
+    dependencies = [
+        ("api", "0010_chatmessage_room_recent_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chatmessage",
+            name="audio_size_bytes",
+            field=models.BigIntegerField(blank=True, help_text="Audio file size in bytes", null=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 - Split migration: User confirmed OTP flag
+
+from django.db import migrations, models
+
+
+def backfill_has_confirmed_otp(apps, schema_editor):
+    User = apps.get_model("api", "User")
+    TOTPDevice = apps.get_model("otp_totp", "TOTPDevice")
+    confirmed_user_ids = TOTPDevice.objects.filter(confirmed=True).values("user_id")
+    User.objects.filter(id__in=confirmed_user_ids).update(has_confirmed_otp=True)
+
+
+class Migration(migrations.Migration):
+    """
+    Migration 12: User confirmed OTP flag
+
+    Stores whether the user has a confirmed TOTP device so login can decide
+    between OTP setup and verification without querying the device table.
+    Existing users with a confirmed device are backfilled.
+    """
+
+    dependencies = [
+        ("api", "0011_chatmessage_audio_size_bytes"),
+        ("otp_totp", "0003_add_timestamps"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="has_confirmed_otp",
+            field=models.BooleanField(default=False, help_text="Whether the user has a confirmed authenticator app"),
+        ),
+        migrations.RunPython(backfill_has_confirmed_otp, migrations.RunPython.noop),
+    ]
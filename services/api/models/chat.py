@@ -57,6 +57,7 @@ class ChatMessage(models.Model):
     has_audio = models.BooleanField(default=False)
     audio_file = models.FileField(upload_to="chat_audio/", null=True, blank=True)
     audio_duration = models.FloatField(null=True, blank=True, help_text="Duration in seconds")
+    audio_size_bytes = models.BigIntegerField(null=True, blank=True, help_text="Audio file size in bytes")
     audio_transcription = models.TextField(blank=True, help_text="Transcribed text from audio")
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -69,6 +70,9 @@ class ChatMessage(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["room", "-created_at"], name="chatmessage_room_recent_idx"),
+        ]
 
     def __str__(self):
         return f"{self.sender_type} - {self.original_text[:50]}"
@@ -50,6 +50,12 @@ class User(AbstractUser):
         help_text="Department (for doctors)",
     )
 
+    # Mirrors whether a confirmed TOTP device exists, so login doesn't need to query for it
+    has_confirmed_otp = models.BooleanField(
+        default=False,
+        help_text="Whether the user has a confirmed authenticator app",
+    )
+
     class Meta:
         db_table = "auth_user"
         verbose_name = "User"
@@ -0,0 +1,36 @@
+"""
+JSON renderer for API responses.
+
+Encodes with orjson when it is installed, which is several times faster than
+the stdlib json module DRF uses, and falls back to DRF's JSONRenderer otherwise.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson."""
+
+    # Handles the types orjson doesn't know about (lazy strings, Decimal, querysets, ...)
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Indented output is only asked for by people reading it, leave that to the stdlib encoder
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Non-string dict keys (e.g. ListField error indexes) are stringified like the stdlib encoder does
+        try:
+            return orjson.dumps(data, default=self._encoder.default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+        except orjson.JSONEncodeError:
+            # Values orjson rejects but the stdlib encoder accepts, such as integers wider than 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
@@ -27,15 +27,8 @@ class ChatMessageSerializer(serializers.ModelSerializer):
             "audio_transcription",
             "created_at",
         ]
-        read_only_fields = [
-            "id",
-            "created_at",
-            "translated_text",
-            "translated_language",
-            "image_description",
-            "audio_url",
-            "audio_transcription",
-        ]
+        # Messages are created by ChatRoomViewSet.send_message, never through this serializer
+        read_only_fields = fields
 
     def get_audio_url(self, obj):
         if obj.audio_file:
@@ -106,12 +99,16 @@ class ChatRoomListSerializer(serializers.ModelSerializer):
             "message_count",
             "last_message",
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        # Listing only, rooms are written through ChatRoomSerializer
+        read_only_fields = fields
 
     def get_has_rag(self, obj):
         return obj.rag_collection is not None
 
     def get_message_count(self, obj):
+        # Annotated by ChatRoomViewSet when listing rooms
+        if hasattr(obj, "message_total"):
+            return obj.message_total
         return obj.messages.count()
 
     def get_last_message(self, obj):
@@ -135,8 +132,9 @@ class ChatRoomListSerializer(serializers.ModelSerializer):
             return None
 
         # Get patient context collection linked to this room
-        patient_contexts = obj.patient_contexts.filter(collection_type="patient_context")
-        if not patient_contexts.exists():
+        # Filtered in Python so rooms listed with prefetched patient_contexts don't query again
+        patient_contexts = [pc for pc in obj.patient_contexts.all() if pc.collection_type == "patient_context"]
+        if not patient_contexts:
             return None
 
         context_data = []
@@ -171,11 +169,12 @@ class ChatRoomListSerializer(serializers.ModelSerializer):
             return None
 
         # Get all knowledge bases linked to patient contexts for this room
-        patient_contexts = obj.patient_contexts.filter(collection_type="patient_context")
+        patient_contexts = [pc for pc in obj.patient_contexts.all() if pc.collection_type == "patient_context"]
         knowledge_bases = set()
 
         for pc in patient_contexts:
             for kb in pc.knowledge_bases.all():
-                knowledge_bases.add((kb.id, kb.name, kb.description, kb.items.count()))
+                items_count = kb.items_total if hasattr(kb, "items_total") else kb.items.count()
+                knowledge_bases.add((kb.id, kb.name, kb.description, items_count))
 
         return [{"id": kb[0], "name": kb[1], "description": kb[2], "items_count": kb[3]} for kb in knowledge_bases]
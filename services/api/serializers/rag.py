@@ -41,6 +41,9 @@ class CollectionSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
     def get_items_count(self, obj):
+        # Annotated by CollectionViewSet when reading collections
+        if hasattr(obj, "items_total"):
+            return obj.items_total
         return obj.items.count()
 
     def get_knowledge_bases_details(self, obj):
@@ -1,3 +1,5 @@
+import copy
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
@@ -26,7 +28,19 @@ class UserSerializer(serializers.ModelSerializer):
             "is_superuser",
             "date_joined",
         ]
-        read_only_fields = ["id", "date_joined", "is_superuser"]
+        # Only used to render users, writes go through UserCreateSerializer/UserUpdateSerializer
+        read_only_fields = fields
+
+    # Unbound fields built from the model once per process, see get_fields
+    _field_prototypes = None
+
+    def get_fields(self):
+        # ModelSerializer introspects the model for every instance, and this serializer is
+        # created on every auth response. Build the fields once and hand out copies.
+        cls = type(self)
+        if cls.__dict__.get("_field_prototypes") is None:
+            cls._field_prototypes = super().get_fields()
+        return copy.deepcopy(cls._field_prototypes)
 
 
 class UserCreateSerializer(serializers.ModelSerializer):
@@ -14,7 +14,7 @@ from .ai import (
 
 # Legacy services (for backward compatibility)
 from .gemini_service import GeminiService, get_gemini_service
-from .rag_service import RAGService
+from .rag_service import RAGService, get_rag_service
 
 __all__ = [
     # AI Factory (new)
@@ -26,4 +26,5 @@ __all__ = [
     "GeminiService",
     "get_gemini_service",
     "RAGService",
+    "get_rag_service",
 ]
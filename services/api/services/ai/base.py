@@ -38,6 +38,15 @@ class BaseEmbeddingService(ABC):
         """Generate embedding vector for text."""
         pass
 
+    def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """
+        Generate embedding vectors for several texts.
+
+        Providers with a batch endpoint override this to embed all texts in
+        one request. Results are returned in the same order as ``texts``.
+        """
+        return [self.generate_embedding(text) for text in texts]
+
     @abstractmethod
     def get_dimensions(self) -> int:
         """Return the embedding dimensions."""
@@ -142,10 +142,18 @@ class AIProviderFactory:
 
 
 # Convenience functions for getting services with default provider
-# Create new factory each time to respect current settings
+# One factory per provider, so service clients are created once per process.
+# The provider is looked up on every call, so a settings change still takes effect.
+_factories: dict[AIProvider, AIProviderFactory] = {}
+
+
 def _get_factory() -> AIProviderFactory:
-    """Get factory with current settings."""
-    return AIProviderFactory()
+    """Get the shared factory for the provider in current settings."""
+    provider = AIProvider(getattr(settings, "AI_PROVIDER", "gemini").lower())
+    factory = _factories.get(provider)
+    if factory is None:
+        factory = _factories.setdefault(provider, AIProviderFactory(provider))
+    return factory
 
 
 def get_translation_service() -> BaseTranslationService:
@@ -108,26 +108,36 @@ class GeminiEmbeddingService(BaseEmbeddingService):
         self.model_name = f"models/{model_name}"
         self.dimensions = dimensions
 
+    def _embed_content(self, content: str | list[str]):
+        try:
+            return genai.embed_content(
+                model=self.model_name,
+                content=content,
+                task_type="retrieval_document",
+                output_dimensionality=self.dimensions,
+            )
+        except TypeError:
+            return genai.embed_content(
+                model=self.model_name,
+                content=content,
+                task_type="retrieval_document",
+            )
+
     def generate_embedding(self, text: str) -> list[float]:
         try:
-            try:
-                result = genai.embed_content(
-                    model=self.model_name,
-                    content=text,
-                    task_type="retrieval_document",
-                    output_dimensionality=self.dimensions,
-                )
-            except TypeError:
-                result = genai.embed_content(
-                    model=self.model_name,
-                    content=text,
-                    task_type="retrieval_document",
-                )
-            return result["embedding"]
+            return self._embed_content(text)["embedding"]
         except Exception as e:
             logger.error(f"Embedding generation failed: {e}")
             raise
 
+    def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        # A list of contents goes through batchEmbedContents in one request
+        try:
+            return self._embed_content(texts)["embedding"]
+        except Exception as e:
+            logger.error(f"Batch embedding generation failed: {e}")
+            raise
+
     def get_dimensions(self) -> int:
         return self.dimensions
 
@@ -3,6 +3,7 @@ from typing import Any
 
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 
 from api.utils import get_language_name
 
@@ -15,17 +16,27 @@ from .base import (
 
 logger = logging.getLogger(__name__)
 
+# Hosts (Ollama, Whisper) and connections per host kept alive by each client session
+OLLAMA_POOL_CONNECTIONS = 4
+OLLAMA_POOL_MAXSIZE = 32
+
 
 class OllamaClient:
     """Base client for Ollama API calls."""
 
     def __init__(self, base_url: str | None = None):
         self.base_url = base_url or getattr(settings, "OLLAMA_BASE_URL", "http://localhost:11434")
+        # Services are reused across requests, so keep-alive connections to Ollama are reused too
+        self.session = requests.Session()
+        # Concurrent request threads share one client, so keep more than the default 10 connections per host
+        adapter = HTTPAdapter(pool_connections=OLLAMA_POOL_CONNECTIONS, pool_maxsize=OLLAMA_POOL_MAXSIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def generate(self, model: str, prompt: str, **kwargs) -> str:
         """Generate text using Ollama."""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
                 json={
                     "model": model,
@@ -45,7 +56,7 @@ class OllamaClient:
         """Generate embeddings using Ollama."""
         try:
             logger.info(f"Generating embedding with model {model} for text: {prompt[:50]}...")
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/embeddings",
                 json={"model": model, "prompt": prompt},
                 timeout=600,  # Increased timeout for first load
@@ -61,10 +72,34 @@ class OllamaClient:
             logger.error(f"Ollama embeddings error: {e}")
             raise Exception(f"Ollama API error: {str(e)}")
 
+    def embed(self, model: str, inputs: list[str]) -> list[list[float]]:
+        """Generate embeddings for several inputs in one call to /api/embed."""
+        try:
+            logger.info(f"Generating {len(inputs)} embeddings with model {model}")
+            response = self.session.post(
+                f"{self.base_url}/api/embed",
+                json={"model": model, "input": inputs},
+                timeout=600,
+            )
+            response.raise_for_status()
+            embeddings = response.json().get("embeddings", [])
+        except requests.Timeout:
+            logger.error("Ollama embed timeout - model may be loading")
+            raise Exception("Ollama timeout - model may still be loading. Try again.")
+        except requests.RequestException as e:
+            logger.error(f"Ollama embed error: {e}")
+            raise Exception(f"Ollama API error: {str(e)}")
+
+        # Callers match embeddings to inputs by position, a short response must not be passed on
+        if len(embeddings) != len(inputs):
+            logger.error(f"Ollama embed returned {len(embeddings)} embeddings for {len(inputs)} inputs")
+            raise Exception(f"Ollama API error: expected {len(inputs)} embeddings, got {len(embeddings)}")
+        return embeddings
+
     def is_available(self) -> bool:
         """Check if Ollama is available."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
         except requests.RequestException:
             return False
@@ -162,6 +197,9 @@ class OllamaEmbeddingService(BaseEmbeddingService):
     def generate_embedding(self, text: str) -> list[float]:
         return self.client.embeddings(self.model, text)
 
+    def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        return self.client.embed(self.model, texts)
+
     def get_dimensions(self) -> int:
         return self._dimensions
 
@@ -200,7 +238,7 @@ class OllamaTranscriptionService(BaseTranscriptionService):
 
         try:
             # Try external Whisper API
-            response = requests.post(
+            response = self.client.session.post(
                 f"{self._whisper_url}/transcribe",
                 files={"audio": ("audio.webm", audio_data, "audio/webm")},
                 data={"language": source_lang if source_lang != "auto" else ""},
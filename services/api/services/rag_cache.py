@@ -0,0 +1,84 @@
+"""
+Semantic cache for RAG query results.
+
+Keeps a small per-process buffer of recent query embeddings per collection and
+reuses the results of a previous query when a new one is nearly identical.
+Consecutive chat turns build very similar RAG queries, so this skips the
+similarity scan over the whole collection for most messages.
+
+Documents are written and deleted by Celery workers and other web processes, so
+each buffer is tied to a collection version (see get_collection_version) and is
+dropped as soon as the caller sees a different one.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any
+
+
+def _normalize(vec: list[float]) -> list[float]:
+    """Scale a vector to unit length so cosine similarity is a plain dot product."""
+    magnitude = math.sqrt(sum(v * v for v in vec))
+    if magnitude == 0:
+        return vec
+    return [v / magnitude for v in vec]
+
+
+class SemanticQueryCache:
+    """In-process LRU of (query embedding, results) tuples, scoped per collection."""
+
+    def __init__(self, max_entries: int = 64, threshold: float = 0.95, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self._buffers: dict[int, tuple[tuple, deque]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, collection_id: int, version: tuple, embedding: list[float]) -> list[dict[str, Any]] | None:
+        """Return cached results for a near-identical query, or None on a miss."""
+        query = _normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            scope = self._buffers.get(collection_id)
+            if scope is None:
+                return None
+
+            buffer_version, buffer = scope
+            if buffer_version != version:
+                # The collection changed since these results were cached
+                del self._buffers[collection_id]
+                return None
+
+            best_entry = None
+            best_score = self.threshold
+            for entry in buffer:
+                cached_vec, results, created_at = entry
+                if now - created_at > self.ttl or len(cached_vec) != len(query):
+                    continue
+                score = sum(a * b for a, b in zip(cached_vec, query))
+                if score >= best_score:
+                    best_entry, best_score = entry, score
+
+            if best_entry is None:
+                return None
+
+            # Move the hit to the most-recent end
+            buffer.remove(best_entry)
+            buffer.append(best_entry)
+            return best_entry[1]
+
+    def set(self, collection_id: int, version: tuple, embedding: list[float], results: list[dict[str, Any]]) -> None:
+        """Store results for a query embedding, evicting the least recently used entry."""
+        with self._lock:
+            scope = self._buffers.get(collection_id)
+            if scope is None or scope[0] != version:
+                scope = (version, deque(maxlen=self.max_entries))
+                self._buffers[collection_id] = scope
+            scope[1].append((_normalize(embedding), results, time.monotonic()))
+
+
+# Process-wide cache used by the chat views
+rag_query_cache = SemanticQueryCache()
@@ -1,7 +1,13 @@
+import heapq
 import logging
 import math
+import operator
+import threading
+from collections import OrderedDict
 from typing import Any
 
+from django.db.models import Count, Max
+
 from api.models import Collection, CollectionItem
 
 logger = logging.getLogger(__name__)
@@ -68,6 +74,16 @@ class RAGService:
             logger.error(f"Error generating embedding: {e}")
             raise
 
+    def _generate_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
+        """Generate embeddings for several texts in a single provider call."""
+        if not texts:
+            return []
+        try:
+            return self._embedding_service.generate_embeddings(texts)
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            raise
+
     def add_document(
         self, name: str, content: str, description: str = "", metadata: dict | None = None
     ) -> CollectionItem:
@@ -88,41 +104,53 @@ class RAGService:
 
     def _cosine_similarity(self, vec1: list[float], vec2: list[float]) -> float:
         """Calculate cosine similarity between two vectors."""
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        magnitude1 = math.sqrt(sum(a * a for a in vec1))
-        magnitude2 = math.sqrt(sum(b * b for b in vec2))
+        magnitude1 = math.hypot(*vec1)
+        magnitude2 = math.hypot(*vec2)
 
         if magnitude1 == 0 or magnitude2 == 0:
             return 0.0
 
-        return dot_product / (magnitude1 * magnitude2)
+        return sum(map(operator.mul, vec1, vec2)) / (magnitude1 * magnitude2)
 
     def query(self, query_text: str, top_k: int = 5) -> list[dict[str, Any]]:
         """Query the collection and return most relevant documents."""
         query_embedding = self._generate_embedding(query_text)
+        return self.query_by_embedding(query_embedding, top_k=top_k)
 
+    def query_by_embedding(self, query_embedding: list[float], top_k: int = 5) -> list[dict[str, Any]]:
+        """Return the documents most similar to an already computed query embedding."""
         items = CollectionItem.objects.filter(collection=self.collection, embedding__isnull=False)
 
-        results = []
-        for item in items:
+        # The query magnitude is the same for every item, so only each item's own magnitude is computed in the loop
+        query_magnitude = math.hypot(*query_embedding)
+
+        scored = []
+        for item in items.iterator(chunk_size=500):
             if item.embedding:
-                similarity = self._cosine_similarity(query_embedding, item.embedding)
-                results.append(
-                    {
-                        "item": item,
-                        "similarity": similarity,
-                        "content": item.content,
-                        "name": item.name,
-                        "metadata": item.metadata,
-                    }
-                )
-
-        results.sort(key=lambda x: x["similarity"], reverse=True)
-        return results[:top_k]
+                item_magnitude = math.hypot(*item.embedding)
+                if query_magnitude == 0 or item_magnitude == 0:
+                    similarity = 0.0
+                else:
+                    similarity = sum(map(operator.mul, query_embedding, item.embedding)) / (
+                        query_magnitude * item_magnitude
+                    )
+                scored.append((similarity, item))
+
+        # Only the top_k matches are kept, there is no need to sort every item
+        return [
+            {
+                "item": item,
+                "similarity": similarity,
+                "content": item.content,
+                "name": item.name,
+                "metadata": item.metadata,
+            }
+            for similarity, item in heapq.nlargest(top_k, scored, key=operator.itemgetter(0))
+        ]
 
     def generate_answer(self, query_text: str, context_docs: list[dict[str, Any]]) -> str:
         """Generate an answer using retrieved documents as context."""
-        context = "\n\n".join([f"Document: {doc['name']}\n{doc['content']}" for doc in context_docs])
+        context = "\n\n".join(f"Document: {doc['name']}\n{doc['content']}" for doc in context_docs)
 
         prompt = f"""Based on the following documents, answer the question.
 
@@ -155,6 +183,46 @@ Answer:"""
         }
 
 
+# Per-process RAGService instances keyed by (collection id, collection updated_at)
+_rag_services: OrderedDict[tuple, RAGService] = OrderedDict()
+_rag_services_lock = threading.Lock()
+_RAG_SERVICES_MAX = 64
+
+
+def get_rag_service(collection: Collection) -> RAGService:
+    """
+    Get or create the RAGService for a collection.
+
+    Instances are reused across requests so the AI provider clients are only
+    set up once per collection. Editing the collection bumps updated_at, which
+    gives it a fresh service with the new settings.
+    """
+    key = (collection.id, collection.updated_at)
+    with _rag_services_lock:
+        service = _rag_services.get(key)
+        if service is not None:
+            _rag_services.move_to_end(key)
+            return service
+
+    service = RAGService(collection)
+    with _rag_services_lock:
+        _rag_services[key] = service
+        if len(_rag_services) > _RAG_SERVICES_MAX:
+            _rag_services.popitem(last=False)
+    return service
+
+
+def get_collection_version(collection: Collection) -> tuple:
+    """
+    Return a value that changes whenever the collection or any of its items changes.
+
+    Built from the collection's updated_at, its item count and the newest item
+    updated_at, so edits, additions and deletions from any process are all seen.
+    """
+    items_state = collection.items.aggregate(total=Count("id"), last_updated=Max("updated_at"))
+    return (collection.updated_at, items_state["total"], items_state["last_updated"])
+
+
 def query_global_knowledge_base(query_text: str, top_k: int = 5) -> list[dict[str, Any]]:
     """
     Query all global knowledge base collections and return combined results.
@@ -170,7 +238,7 @@ def query_global_knowledge_base(query_text: str, top_k: int = 5) -> list[dict[st
 
     for collection in global_collections:
         try:
-            rag_service = RAGService(collection)
+            rag_service = get_rag_service(collection)
             results = rag_service.query(query_text, top_k=top_k)
             for result in results:
                 result["collection_name"] = collection.name
@@ -201,7 +269,7 @@ def query_patient_context(chat_room_id: int, query_text: str, top_k: int = 3) ->
     for collection in patient_collections:
         # Query the patient context itself
         try:
-            rag_service = RAGService(collection)
+            rag_service = get_rag_service(collection)
             results = rag_service.query(query_text, top_k=top_k)
             for result in results:
                 result["collection_name"] = collection.name
@@ -218,7 +286,7 @@ def query_patient_context(chat_room_id: int, query_text: str, top_k: int = 3) ->
     for kb_id in linked_kb_ids:
         try:
             kb = Collection.objects.get(id=kb_id)
-            rag_service = RAGService(kb)
+            rag_service = get_rag_service(kb)
             results = rag_service.query(query_text, top_k=top_k)
             for result in results:
                 result["collection_name"] = kb.name
@@ -0,0 +1,21 @@
+"""
+Signal handlers for the API app.
+
+User.has_confirmed_otp mirrors whether the user has a confirmed TOTP device.
+Devices are created, confirmed and deleted by our auth views, the two_factor
+views and the admin, so the flag is recomputed whenever any device changes.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django_otp.plugins.otp_totp.models import TOTPDevice
+
+from api.models import User
+
+
+@receiver(post_save, sender=TOTPDevice)
+@receiver(post_delete, sender=TOTPDevice)
+def sync_has_confirmed_otp(sender, instance, **kwargs):
+    """Recompute the user's has_confirmed_otp flag from their TOTP devices."""
+    confirmed = TOTPDevice.objects.filter(user_id=instance.user_id, confirmed=True).exists()
+    User.objects.filter(pk=instance.user_id).update(has_confirmed_otp=confirmed)
@@ -9,7 +9,13 @@ from .assistance_tasks import generate_doctor_assistance_async
 from .audio_tasks import transcribe_audio_async
 from .cleanup_tasks import cleanup_expired_cache, cleanup_old_audio_files
 from .dataset_tasks import import_all_hf_languages, import_hf_dataset_async
-from .rag_tasks import generate_embeddings_async, process_document_async
+from .event_tasks import publish_event_task
+from .rag_tasks import (
+    add_patient_context_async,
+    generate_embeddings_async,
+    process_document_async,
+    process_documents_batch_async,
+)
 from .translation_tasks import translate_text_async
 
 logger = logging.getLogger(__name__)
@@ -62,10 +68,13 @@ __all__ = [
     "transcribe_audio_async",
     "translate_text_async",
     "process_document_async",
+    "process_documents_batch_async",
     "generate_embeddings_async",
+    "add_patient_context_async",
     "generate_doctor_assistance_async",
     "cleanup_old_audio_files",
     "cleanup_expired_cache",
     "import_hf_dataset_async",
     "import_all_hf_languages",
+    "publish_event_task",
 ]
@@ -3,6 +3,11 @@ from datetime import datetime
 
 from django.core.cache import cache
 
+from api.events import publish_event
+from api.models import ChatRoom
+from api.services.gemini_service import get_gemini_service
+from api.services.rag_service import get_rag_service
+from api.utils import cache_timeout
 from celery import shared_task
 
 logger = logging.getLogger(__name__)
@@ -14,6 +19,8 @@ logger = logging.getLogger(__name__)
     retry_backoff=True,
     max_retries=3,
     queue="assistance",
+    time_limit=120,
+    soft_time_limit=90,
 )
 def generate_doctor_assistance_async(self, room_id: int, request_type: str = "general"):
     """
@@ -33,10 +40,6 @@ def generate_doctor_assistance_async(self, room_id: int, request_type: str = "ge
     Returns:
         dict with assistance result
     """
-    from api.events import publish_event
-    from api.models import ChatRoom
-    from api.services.rag_service import RAGService
-
     logger.info(f"Generating doctor assistance for room {room_id}")
 
     try:
@@ -49,10 +52,10 @@ def generate_doctor_assistance_async(self, room_id: int, request_type: str = "ge
             }
 
         # Get recent conversation
-        recent_messages = room.messages.order_by("-created_at")[:10]
-        conversation_context = "\n".join(
-            [f"{msg.sender_type}: {msg.original_text}" for msg in reversed(list(recent_messages))]
-        )
+        # Only the two text columns feed the prompt, fetched as tuples newest first then put in order
+        recent_messages = list(room.messages.order_by("-created_at").values_list("sender_type", "original_text")[:10])
+        recent_messages.reverse()
+        conversation_context = "\n".join(f"{sender_type}: {text}" for sender_type, text in recent_messages)
 
         # Build assistance query based on type
         if request_type == "cultural":
@@ -115,7 +118,7 @@ Please suggest:
 """
 
         # Query RAG and generate assistance
-        rag_service = RAGService(room.rag_collection)
+        rag_service = get_rag_service(room.rag_collection)
         result = rag_service.query_and_answer(query, top_k=5)
 
         if result["status"] != "success":
@@ -186,15 +189,13 @@ SOURCES USED:
         raise self.retry(exc=e)
 
 
-@shared_task(queue="assistance")
+@shared_task(queue="assistance", time_limit=120, soft_time_limit=90)
 def generate_cultural_tips(patient_language: str, doctor_language: str):
     """
     Generate general cultural communication tips.
 
     Useful for onboarding new doctors or general guidance.
     """
-    from api.services.gemini_service import get_gemini_service
-
     cache_key = f"cultural_tips:{patient_language}:{doctor_language}"
     cached = cache.get(cache_key)
 
@@ -224,6 +225,6 @@ Format as a concise, actionable guide.
         # Fallback if generation fails
         tips = f"Cultural tips for {patient_language} <-> {doctor_language} communication"
 
-    cache.set(cache_key, tips, timeout=86400)  # 24 hours
+    cache.set(cache_key, tips, timeout=cache_timeout("cultural_tips"))
 
     return {"status": "success", "tips": tips}
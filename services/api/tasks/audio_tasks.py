@@ -2,6 +2,11 @@ import logging
 
 from django.core.cache import cache
 
+from api.events import publish_event
+from api.models import ChatMessage
+from api.services.gemini_service import get_gemini_service
+from api.tasks.translation_tasks import translate_text_async
+from api.utils import cache_timeout
 from celery import shared_task
 
 logger = logging.getLogger(__name__)
@@ -15,7 +20,7 @@ logger = logging.getLogger(__name__)
     max_retries=3,
     queue="audio",
 )
-def transcribe_audio_async(self, message_id: int, audio_data: bytes, source_lang: str):
+def transcribe_audio_async(self, message_id: int, source_lang: str, audio_data: bytes | None = None):
     """
     Transcribe audio in the background.
 
@@ -28,21 +33,25 @@ def transcribe_audio_async(self, message_id: int, audio_data: bytes, source_lang
 
     Args:
         message_id: ID of the ChatMessage to update
-        audio_data: Raw audio bytes
         source_lang: Source language code
+        audio_data: Raw audio bytes, read from the message's stored audio file when omitted
 
     Returns:
         dict with transcription result
     """
-    from api.events import publish_event
-    from api.models import ChatMessage
-    from api.services.gemini_service import get_gemini_service
-
     logger.info(f"Starting audio transcription for message {message_id}")
 
     try:
         # Get the message
-        message = ChatMessage.objects.get(id=message_id)
+        message = (
+            ChatMessage.objects.select_related("room")
+            .only("id", "room_id", "sender_type", "audio_file", "room__doctor_language", "room__patient_language")
+            .get(id=message_id)
+        )
+
+        if audio_data is None:
+            with message.audio_file.open("rb") as audio_file:
+                audio_data = audio_file.read()
 
         # Check cache first
         cache_key = f"transcription:{hash(audio_data)}"
@@ -61,13 +70,13 @@ def transcribe_audio_async(self, message_id: int, audio_data: bytes, source_lang
 
             transcription = result["transcription"]
 
-            # Cache the result (1 hour)
-            cache.set(cache_key, transcription, timeout=3600)
+            # Cache the result (about 1 hour)
+            cache.set(cache_key, transcription, timeout=cache_timeout("transcription"))
 
         # Update message
         message.audio_transcription = transcription
         message.original_text = transcription
-        message.save()
+        message.save(update_fields=["audio_transcription", "original_text"])
 
         # Publish event
         publish_event(
@@ -81,8 +90,6 @@ def transcribe_audio_async(self, message_id: int, audio_data: bytes, source_lang
         )
 
         # Trigger translation task
-        from api.tasks.translation_tasks import translate_text_async
-
         target_lang = (
             message.room.doctor_language if message.sender_type == "patient" else message.room.patient_language
         )
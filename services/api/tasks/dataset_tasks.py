@@ -1,5 +1,10 @@
 import logging
 
+from django.conf import settings
+
+from api.events import publish_event
+from api.models import Collection, CollectionItem
+from api.tasks.rag_tasks import process_document_async
 from api.utils import LANGUAGE_NAMES
 from celery import shared_task
 
@@ -41,11 +46,6 @@ def import_hf_dataset_async(
     Returns:
         dict with import results
     """
-    from django.conf import settings
-
-    from api.events import publish_event
-    from api.models import Collection, CollectionItem
-
     if lang_code not in LANGUAGE_NAMES:
         return {
             "status": "error",
@@ -196,8 +196,6 @@ def import_hf_dataset_async(
                 )
 
                 # Queue embedding generation
-                from api.tasks.rag_tasks import process_document_async
-
                 process_document_async.delay(item_obj.id)
                 created_count += 1
 
@@ -269,10 +267,6 @@ def import_all_hf_languages(
     Returns:
         dict with queued task info
     """
-    from django.conf import settings
-
-    from api.events import publish_event
-
     # Use provided token or fall back to settings
     hf_token = hf_token or getattr(settings, "HF_TOKEN", "")
 
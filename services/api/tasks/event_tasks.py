@@ -0,0 +1,22 @@
+import logging
+
+from api.events import publish_event
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def publish_event_task(event_type: str, payload: dict):
+    """
+    Publish an event to the message bus from a worker.
+
+    Used by publish_event_async so request handlers don't wait on the
+    broker's publisher confirm for non-critical events.
+
+    Args:
+        event_type: Type of event (e.g., "message.created")
+        payload: Event data dictionary
+    """
+    if not publish_event(event_type, payload):
+        logger.warning(f"Event {event_type} could not be published")
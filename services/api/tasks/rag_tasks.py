@@ -1,12 +1,65 @@
 import hashlib
 import logging
+from itertools import islice
 
 from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
 
-from celery import shared_task
+from api.events import publish_event
+from api.models import Collection, CollectionItem
+from api.services.rag_service import RAGService, get_rag_service
+from api.utils import cache_timeout
+from celery import group, shared_task
 
 logger = logging.getLogger(__name__)
 
+# Number of documents dispatched per Celery group
+ENQUEUE_BATCH_SIZE = 500
+
+# Number of rows cleared per UPDATE when reindexing a collection
+REINDEX_BATCH_SIZE = 1000
+
+
+# Number of chunks sent to the embedding provider per call when processing documents in batches
+EMBED_BATCH_SIZE = 32
+
+
+def _split_for_embedding(rag_service: RAGService, item: CollectionItem) -> list[str]:
+    """Return the chunks of an item's content that each need an embedding."""
+    # Items that are already a chunk of a larger document are not split again
+    if "chunk_index" in (item.metadata or {}):
+        return [item.content]
+    return rag_service._chunk_text(item.content) or [item.content]
+
+
+def _apply_chunk_embeddings(
+    item: CollectionItem, chunks: list[str], embeddings: list[list[float]]
+) -> list[CollectionItem]:
+    """
+    Store the first chunk and its embedding on the item itself.
+
+    Returns unsaved items for the remaining chunks, ready for bulk_create.
+    """
+    metadata = item.metadata or {}
+
+    item.content = chunks[0]
+    item.embedding = embeddings[0]
+    if len(chunks) > 1:
+        item.metadata = {**metadata, "chunk_index": 1, "chunk_count": len(chunks)}
+
+    return [
+        CollectionItem(
+            collection_id=item.collection_id,
+            name=f"{item.name[:170]} (part {i + 1}/{len(chunks)})",
+            description=item.description,
+            content=chunks[i],
+            metadata={**metadata, "chunk_index": i + 1, "chunk_count": len(chunks), "parent_id": item.id},
+            embedding=embeddings[i],
+        )
+        for i in range(1, len(chunks))
+    ]
+
 
 @shared_task(
     bind=True,
@@ -32,27 +85,27 @@ def process_document_async(self, document_id: int):
     Returns:
         dict with processing result
     """
-    from api.events import publish_event
-    from api.models import CollectionItem
-    from api.services.rag_service import RAGService
-
     logger.info(f"Processing document {document_id}")
 
     try:
-        item = CollectionItem.objects.get(id=document_id)
+        item = CollectionItem.objects.select_related("collection").get(id=document_id)
 
         # Check if already processed
         if item.embedding:
             logger.info(f"Document {document_id} already has embeddings")
             return {"status": "already_processed", "document_id": document_id}
 
-        # Generate embedding
-        rag_service = RAGService(item.collection)
-        embedding = rag_service._generate_embedding(item.content)
+        rag_service = get_rag_service(item.collection)
+        chunks = _split_for_embedding(rag_service, item)
+
+        # Embed all chunks in a single provider call
+        embeddings = rag_service._generate_embeddings_batch(chunks)
+        new_items = _apply_chunk_embeddings(item, chunks, embeddings)
 
-        # Store embedding
-        item.embedding = embedding
-        item.save()
+        with transaction.atomic():
+            item.save()
+            if new_items:
+                CollectionItem.objects.bulk_create(new_items, batch_size=500)
 
         # Publish event
         publish_event(
@@ -61,15 +114,17 @@ def process_document_async(self, document_id: int):
                 "document_id": document_id,
                 "collection_id": item.collection_id,
                 "name": item.name,
+                "chunks": len(chunks),
             },
         )
 
-        logger.info(f"Document {document_id} processed successfully")
+        logger.info(f"Document {document_id} processed successfully ({len(chunks)} chunks)")
 
         return {
             "status": "success",
             "document_id": document_id,
-            "embedding_size": len(embedding) if embedding else 0,
+            "chunks": len(chunks),
+            "embedding_size": len(embeddings[0]) if embeddings[0] else 0,
         }
 
     except CollectionItem.DoesNotExist:
@@ -81,6 +136,97 @@ def process_document_async(self, document_id: int):
         raise self.retry(exc=e)
 
 
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=3,
+    queue="rag",
+)
+def process_documents_batch_async(self, document_ids: list[int], batch_size: int = EMBED_BATCH_SIZE):
+    """
+    Process several documents of a collection and generate their embeddings together.
+
+    Chunks from all documents are embedded in provider calls of up to
+    batch_size texts, instead of one call per document.
+
+    Args:
+        document_ids: IDs of the CollectionItems to process
+        batch_size: Maximum number of chunks per embedding call
+
+    Returns:
+        dict with processing summary
+    """
+    logger.info(f"Processing batch of {len(document_ids)} documents")
+
+    items = list(
+        CollectionItem.objects.select_related("collection").filter(id__in=document_ids, embedding__isnull=True)
+    )
+    if not items:
+        return {"status": "already_processed", "processed": 0}
+
+    # Documents in one batch usually share a collection, but each collection has its own provider
+    items_by_collection = {}
+    for item in items:
+        items_by_collection.setdefault(item.collection_id, []).append(item)
+
+    processed = 0
+    chunk_total = 0
+    try:
+        for collection_items in items_by_collection.values():
+            rag_service = get_rag_service(collection_items[0].collection)
+            item_chunks = [_split_for_embedding(rag_service, item) for item in collection_items]
+
+            texts = [chunk for chunks in item_chunks for chunk in chunks]
+            embeddings = []
+            for start in range(0, len(texts), batch_size):
+                embeddings.extend(rag_service._generate_embeddings_batch(texts[start : start + batch_size]))
+
+            new_items = []
+            offset = 0
+            for item, chunks in zip(collection_items, item_chunks):
+                new_items.extend(_apply_chunk_embeddings(item, chunks, embeddings[offset : offset + len(chunks)]))
+                offset += len(chunks)
+
+            # bulk_update skips auto_now, set updated_at so cached answers for the collection are refreshed
+            now = timezone.now()
+            for item in collection_items:
+                item.updated_at = now
+
+            with transaction.atomic():
+                CollectionItem.objects.bulk_update(
+                    collection_items, ["content", "embedding", "metadata", "updated_at"], batch_size=500
+                )
+                if new_items:
+                    CollectionItem.objects.bulk_create(new_items, batch_size=500)
+
+            for item, chunks in zip(collection_items, item_chunks):
+                publish_event(
+                    "document.processed",
+                    {
+                        "document_id": item.id,
+                        "collection_id": item.collection_id,
+                        "name": item.name,
+                        "chunks": len(chunks),
+                    },
+                )
+
+            processed += len(collection_items)
+            chunk_total += len(texts)
+
+    except Exception as e:
+        logger.error(f"Batch document processing failed: {e}")
+        raise self.retry(exc=e)
+
+    logger.info(f"Processed {processed} documents ({chunk_total} chunks)")
+
+    return {
+        "status": "success",
+        "processed": processed,
+        "chunks": chunk_total,
+    }
+
+
 @shared_task(
     bind=True,
     autoretry_for=(Exception,),
@@ -98,28 +244,33 @@ def generate_embeddings_async(self, collection_id: int):
     Returns:
         dict with processing summary
     """
-    from api.models import Collection, CollectionItem
-
     logger.info(f"Generating embeddings for collection {collection_id}")
 
     try:
         collection = Collection.objects.get(id=collection_id)
-        items = CollectionItem.objects.filter(
-            collection=collection,
-            embedding__isnull=True,
+        item_ids = (
+            CollectionItem.objects.filter(
+                collection=collection,
+                embedding__isnull=True,
+            )
+            .values_list("id", flat=True)
+            .iterator(chunk_size=ENQUEUE_BATCH_SIZE)
         )
 
         processed = 0
         failed = 0
 
-        for item in items:
+        # Queue document processing, one group per batch of ids with each task embedding EMBED_BATCH_SIZE documents
+        while batch := list(islice(item_ids, ENQUEUE_BATCH_SIZE)):
             try:
-                # Queue individual document processing
-                process_document_async.delay(item.id)
-                processed += 1
+                group(
+                    process_documents_batch_async.s(batch[start : start + EMBED_BATCH_SIZE])
+                    for start in range(0, len(batch), EMBED_BATCH_SIZE)
+                ).apply_async()
+                processed += len(batch)
             except Exception as e:
-                logger.error(f"Failed to queue document {item.id}: {e}")
-                failed += 1
+                logger.error(f"Failed to queue {len(batch)} documents: {e}")
+                failed += len(batch)
 
         logger.info(f"Collection {collection_id}: queued {processed} documents, " f"{failed} failed")
 
@@ -135,6 +286,51 @@ def generate_embeddings_async(self, collection_id: int):
         return {"status": "error", "error": "Collection not found"}
 
 
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=3,
+    queue="rag",
+)
+def add_patient_context_async(
+    self, collection_id: int, name: str, content: str, description: str = "", metadata: dict | None = None
+):
+    """
+    Embed and store a patient profile document in the background.
+
+    Args:
+        collection_id: ID of the Collection to add the document to
+        name: Document name
+        content: Document content
+        description: Short document description
+        metadata: Extra metadata stored with the document
+
+    Returns:
+        dict with the created document id
+    """
+    logger.info(f"Adding patient context '{name}' to collection {collection_id}")
+
+    try:
+        collection = Collection.objects.get(id=collection_id)
+        item = get_rag_service(collection).add_document(
+            name=name,
+            content=content,
+            description=description,
+            metadata=metadata,
+        )
+
+        return {
+            "status": "success",
+            "collection_id": collection_id,
+            "document_id": item.id,
+        }
+
+    except Collection.DoesNotExist:
+        logger.error(f"Collection {collection_id} not found")
+        return {"status": "error", "error": "Collection not found"}
+
+
 @shared_task(queue="rag")
 def reindex_collection(collection_id: int):
     """
@@ -145,15 +341,16 @@ def reindex_collection(collection_id: int):
     - Collection settings change
     - Manual reindex requested
     """
-    from api.models import Collection, CollectionItem
-
     logger.info(f"Reindexing collection {collection_id}")
 
     try:
         collection = Collection.objects.get(id=collection_id)
 
-        # Clear existing embeddings
-        CollectionItem.objects.filter(collection=collection).update(embedding=None)
+        # Clear existing embeddings in small batches so row locks are held briefly
+        pending = CollectionItem.objects.filter(collection=collection, embedding__isnull=False)
+        while batch := list(pending.values_list("id", flat=True)[:REINDEX_BATCH_SIZE]):
+            with transaction.atomic():
+                CollectionItem.objects.filter(id__in=batch).update(embedding=None)
 
         # Regenerate all embeddings
         generate_embeddings_async.delay(collection_id)
@@ -178,7 +375,7 @@ def cache_rag_query(collection_id: int, query: str, results: list):
         query: The query string
         results: Query results to cache
     """
-    cache_key = f"rag:{collection_id}:{hashlib.sha256(query.encode()).hexdigest()[:16]}"
-    cache.set(cache_key, results, timeout=1800)  # 30 minutes
+    cache_key = f"rag:{collection_id}:{hashlib.blake2b(query.encode(), digest_size=8).hexdigest()}"
+    cache.set(cache_key, results, timeout=cache_timeout("rag_query"))
 
     return {"status": "cached", "cache_key": cache_key}
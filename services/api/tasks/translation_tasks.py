@@ -3,6 +3,11 @@ import logging
 
 from django.core.cache import cache
 
+from api.events import publish_event
+from api.models import ChatMessage
+from api.services.gemini_service import get_gemini_service
+from api.services.rag_service import get_translation_context
+from api.utils import cache_timeout, get_tiered, set_tiered
 from celery import shared_task
 
 logger = logging.getLogger(__name__)
@@ -11,7 +16,7 @@ logger = logging.getLogger(__name__)
 def get_translation_cache_key(text: str, source_lang: str, target_lang: str) -> str:
     """Generate a unique cache key for translation."""
     content = f"{text}:{source_lang}:{target_lang}"
-    return f"translation:{hashlib.sha256(content.encode()).hexdigest()[:16]}"
+    return f"translation:{hashlib.blake2b(content.encode(), digest_size=8).hexdigest()}"
 
 
 @shared_task(
@@ -20,6 +25,8 @@ def get_translation_cache_key(text: str, source_lang: str, target_lang: str) ->
     retry_backoff=True,
     max_retries=3,
     queue="translation",
+    time_limit=120,
+    soft_time_limit=90,
 )
 def translate_text_async(
     self,
@@ -50,11 +57,6 @@ def translate_text_async(
     Returns:
         dict with translation result
     """
-    from api.events import publish_event
-    from api.models import ChatMessage
-    from api.services.gemini_service import get_gemini_service
-    from api.services.rag_service import get_translation_context
-
     logger.info(f"Starting translation for message {message_id}")
 
     try:
@@ -62,7 +64,7 @@ def translate_text_async(
 
         # Check cache first
         cache_key = get_translation_cache_key(text, source_lang, target_lang)
-        cached_translation = cache.get(cache_key)
+        cached_translation = get_tiered(cache_key)
 
         if cached_translation:
             logger.info(f"Cache hit for translation {message_id}")
@@ -98,10 +100,13 @@ def translate_text_async(
                     logger.warning(f"RAG query failed: {e}")
 
             # Get conversation history
-            recent_messages = message.room.messages.order_by("-created_at")[:5]
-            history = [
-                {"sender_type": msg.sender_type, "text": msg.original_text} for msg in reversed(list(recent_messages))
-            ]
+            recent_messages = list(
+                ChatMessage.objects.filter(room_id=message.room_id)
+                .order_by("-created_at")
+                .values_list("sender_type", "original_text")[:5]
+            )
+            recent_messages.reverse()
+            history = [{"sender_type": sender, "text": text} for sender, text in recent_messages]
 
             # Translate
             gemini = get_gemini_service()
@@ -114,13 +119,13 @@ def translate_text_async(
                 rag_context=rag_context,
             )
 
-            # Cache the result (1 hour)
-            cache.set(cache_key, translated_text, timeout=3600)
+            # Cache the result (about 1 hour)
+            set_tiered(cache_key, translated_text, cache_timeout("translation"))
 
         # Update message
         message.translated_text = translated_text
         message.translated_language = target_lang
-        message.save()
+        message.save(update_fields=["translated_text", "translated_language"])
 
         # Publish event
         publish_event(
@@ -152,7 +157,7 @@ def translate_text_async(
         raise self.retry(exc=e)
 
 
-@shared_task(queue="translation")
+@shared_task(queue="translation", time_limit=120, soft_time_limit=90)
 def batch_translate(translations: list[dict]):
     """
     Batch translate multiple texts.
@@ -165,10 +170,17 @@ def batch_translate(translations: list[dict]):
     """
     results = []
 
+    # Hash each distinct (text, source, target) once, then fetch them in a single round trip
+    key_by_item = {}
     for item in translations:
-        cache_key = get_translation_cache_key(item["text"], item["source_lang"], item["target_lang"])
-
-        cached = cache.get(cache_key)
+        triple = (item["text"], item["source_lang"], item["target_lang"])
+        if triple not in key_by_item:
+            key_by_item[triple] = get_translation_cache_key(*triple)
+    cache_keys = [key_by_item[(i["text"], i["source_lang"], i["target_lang"])] for i in translations]
+    cached_map = cache.get_many(list(key_by_item.values()))
+
+    for item, cache_key in zip(translations, cache_keys):
+        cached = cached_map.get(cache_key)
         if cached:
             results.append(
                 {
@@ -1,5 +1,6 @@
 """Utility functions for the API."""
 
+from .cache import cache_timeout, get_tiered, set_tiered
 from .languages import (
     LANGUAGE_NAMES,
     SA_LANGUAGE_CODES,
@@ -8,6 +9,9 @@ from .languages import (
 )
 
 __all__ = [
+    "cache_timeout",
+    "get_tiered",
+    "set_tiered",
     "LANGUAGE_NAMES",
     "SA_LANGUAGE_CODES",
     "get_language_name",
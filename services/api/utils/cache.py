@@ -0,0 +1,42 @@
+"""
+Cache timeout helpers.
+
+Entries written in bursts (dataset imports, reindexing, busy chat rooms) would
+otherwise all expire at the same moment and send every miss to the AI providers
+at once. Timeouts are spread around their configured value instead.
+
+Hot, immutable entries such as translations can also be read through the
+per-process "l1" cache, which saves the Redis round trip on repeated hits.
+"""
+
+import random
+
+from django.conf import settings
+from django.core.cache import cache, caches
+
+
+def cache_timeout(name: str) -> int:
+    """Return the CACHE_TIMEOUTS value for name, randomly moved by up to CACHE_TIMEOUT_JITTER."""
+    timeout = settings.CACHE_TIMEOUTS[name]
+    jitter = int(timeout * getattr(settings, "CACHE_TIMEOUT_JITTER", 0))
+    if jitter <= 0:
+        return timeout
+    return timeout + random.randint(-jitter, jitter)
+
+
+def get_tiered(key: str):
+    """Return a cached value from the per-process L1 cache, falling back to the default cache."""
+    l1 = caches["l1"]
+    value = l1.get(key)
+    if value is None:
+        value = cache.get(key)
+        if value is not None:
+            l1.set(key, value)
+    return value
+
+
+def set_tiered(key: str, value, timeout: int) -> None:
+    """Store a value in the default cache and the per-process L1 cache."""
+    cache.set(key, value, timeout=timeout)
+    # L1 keeps its own short timeout so it never outlives the shared entry by much
+    caches["l1"].set(key, value, timeout=min(timeout, caches["l1"].default_timeout))
@@ -1,9 +1,12 @@
+import itertools
 import logging
 
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth import login as django_login
 from django.contrib.auth import logout as django_logout
+from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.vary import vary_on_cookie
 from rest_framework import status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -80,18 +83,12 @@ def login(request):
     requires_otp_setup = False
     requires_otp_verify = False
 
-    try:
-        from django_otp.plugins.otp_totp.models import TOTPDevice
-
-        has_otp_device = TOTPDevice.objects.filter(user=user, confirmed=True).exists()
-        if not has_otp_device:
-            # User needs to set up OTP first
-            requires_otp_setup = True
-        else:
-            # User has OTP, needs to verify
-            requires_otp_verify = True
-    except ImportError:
-        pass
+    if not user.has_confirmed_otp:
+        # User needs to set up OTP first
+        requires_otp_setup = True
+    else:
+        # User has OTP, needs to verify
+        requires_otp_verify = True
 
     return Response(
         {
@@ -103,6 +100,8 @@ def login(request):
     )
 
 
+@cache_control(private=True, max_age=10)
+@vary_on_cookie
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def me(request):
@@ -147,7 +146,7 @@ def change_password(request):
     )
     if serializer.is_valid():
         request.user.set_password(serializer.validated_data["new_password"])
-        request.user.save()
+        request.user.save(update_fields=["password"])
         return Response({"status": "success", "message": "Password changed successfully"})
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -164,6 +163,13 @@ def logout(request):
     return Response({"status": "success", "message": "Logged out successfully"})
 
 
+def _other_devices(user, devices_for_user):
+    """Lazily yield the user's confirmed non-TOTP OTP devices."""
+    for device in devices_for_user(user):
+        if device._meta.model_name != "totpdevice":
+            yield device
+
+
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def verify_otp(request):
@@ -178,12 +184,20 @@ def verify_otp(request):
             {"error": "OTP token is required"},
             status=status.HTTP_400_BAD_REQUEST,
         )
+    otp_token = str(otp_token).strip()
 
     try:
         from django_otp import devices_for_user
+        from django_otp.plugins.otp_totp.models import TOTPDevice
 
-        # Try to verify the token against user's devices
-        for device in devices_for_user(request.user):
+        # The authenticator app device is the common case, check it with a single query
+        totp_device = TOTPDevice.objects.filter(user=request.user, confirmed=True).first()
+        # Skip the TOTP check outright when the token can't be a code for this device
+        token_fits_totp = totp_device and otp_token.isdigit() and len(otp_token) == totp_device.digits
+        candidates = [totp_device] if token_fits_totp else []
+
+        # Fall back to the other device types (email, backup tokens) only when TOTP doesn't match
+        for device in itertools.chain(candidates, _other_devices(request.user, devices_for_user)):
             if device.verify_token(otp_token):
                 # Mark the session as OTP-verified
                 request.session["otp_device_id"] = device.persistent_id
@@ -245,15 +259,15 @@ def setup_otp(request):
         qr.add_data(config_url)
         qr.make(fit=True)
 
-        # Create QR code image as base64
-        img = qr.make_image(fill_color="black", back_color="white")
+        # Render the QR code as an SVG path, which needs no raster encoding
+        img = qr.make_image(image_factory=qrcode.image.svg.SvgPathImage)
         buffer = BytesIO()
-        img.save(buffer, format="PNG")
+        img.save(buffer)
         qr_base64 = base64.b64encode(buffer.getvalue()).decode()
 
         return Response(
             {
-                "qr_code": f"data:image/png;base64,{qr_base64}",
+                "qr_code": f"data:image/svg+xml;base64,{qr_base64}",
                 "secret": device.key,
             }
         )
@@ -294,7 +308,7 @@ def confirm_otp_setup(request):
         # Verify the token
         if device.verify_token(otp_token):
             device.confirmed = True
-            device.save()
+            device.save(update_fields=["confirmed"])
 
             # Mark session as verified
             request.session["otp_device_id"] = device.persistent_id
@@ -340,14 +354,21 @@ class UserViewSet(viewsets.ModelViewSet):
             return UserUpdateSerializer
         return UserSerializer
 
+    def _list_active_by_role(self, role):
+        """Return a paginated list of active users with the given role."""
+        # Read-only listing, so rows go straight to dicts without model instances or a serializer
+        users = User.objects.filter(role=role, is_active=True).order_by("id").values(*UserSerializer.Meta.fields)
+        page = self.paginate_queryset(users)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(users))
+
     @action(detail=False, methods=["get"])
     def doctors(self, request):
         """List all doctors."""
-        doctors = User.objects.filter(role="doctor", is_active=True)
-        return Response(UserSerializer(doctors, many=True).data)
+        return self._list_active_by_role("doctor")
 
     @action(detail=False, methods=["get"])
     def patients(self, request):
         """List all patients."""
-        patients = User.objects.filter(role="patient", is_active=True)
-        return Response(UserSerializer(patients, many=True).data)
+        return self._list_active_by_role("patient")
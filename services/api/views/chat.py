@@ -1,24 +1,46 @@
-import base64
 import logging
+from binascii import a2b_base64
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import UploadedFile
+from django.db.models import Count, Prefetch
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from api.events import publish_event, publish_event_async
 from api.models import ChatMessage, ChatRoom, Collection
 from api.permissions import CanGetAIAssistance, CanViewPatientContext
 from api.serializers import ChatMessageSerializer, ChatRoomListSerializer, ChatRoomSerializer
 from api.services.ai import get_transcription_service, get_translation_service
-from api.services.rag_service import RAGService
+from api.services.gemini_service import get_gemini_service
+from api.services.rag_cache import rag_query_cache
+from api.services.rag_service import get_collection_version, get_rag_service
+from celery import current_app
 
 logger = logging.getLogger(__name__)
 
 # Check if Celery is available for async processing
 CELERY_ENABLED = getattr(settings, "CELERY_BROKER_URL", None) is not None
 
+# Tasks are sent by name with send_task, which still routes them to their queues through CELERY_TASK_ROUTES
+TRANSCRIBE_AUDIO_TASK = "api.tasks.audio_tasks.transcribe_audio_async"
+ADD_PATIENT_CONTEXT_TASK = "api.tasks.rag_tasks.add_patient_context_async"
+DOCTOR_ASSISTANCE_TASK = "api.tasks.assistance_tasks.generate_doctor_assistance_async"
+
+# Recordings shorter than this are rejected as empty
+MIN_AUDIO_BYTES = 500
+# Base64 length of MIN_AUDIO_BYTES, lets short payloads be rejected without decoding them
+MIN_AUDIO_BASE64_LENGTH = 4 * -(-MIN_AUDIO_BYTES // 3)
+
+# Image analysis runs here while the request thread does RAG lookup and translation
+_image_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="image-analysis")
+
 
 class ChatRoomViewSet(viewsets.ModelViewSet):
     """ViewSet for managing chat rooms."""
@@ -38,6 +60,24 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
             return ChatRoomListSerializer
         return ChatRoomSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset().select_related("rag_collection")
+
+        # Eager-load what the serializers read so listing rooms doesn't query per row
+        if self.action == "list":
+            # Meta.ordering is left out of GROUP BY queries, so the newest-first order is restated
+            queryset = queryset.annotate(message_total=Count("messages")).order_by(*ChatRoom._meta.ordering)
+            if self.request.user.is_authenticated and self.request.user.can_view_patient_context():
+                knowledge_bases = Collection.objects.annotate(items_total=Count("items"))
+                patient_contexts = Collection.objects.filter(
+                    collection_type=Collection.CollectionType.PATIENT_CONTEXT
+                ).prefetch_related(Prefetch("knowledge_bases", queryset=knowledge_bases))
+                queryset = queryset.prefetch_related(Prefetch("patient_contexts", queryset=patient_contexts))
+        elif self.action == "retrieve":
+            queryset = queryset.prefetch_related("messages")
+
+        return queryset
+
     @action(detail=True, methods=["post"])
     def send_message(self, request, pk=None):
         """
@@ -57,6 +97,19 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
         if not text and not audio_data:
             return Response({"error": "Either text or audio is required"}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Validate the recording before anything is written
+        audio_bytes = None
+        if audio_data:
+            try:
+                audio_bytes = self._decode_audio(audio_data)
+            except ValueError as e:
+                return Response({"error": f"Invalid audio data: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
+            if audio_bytes is None:
+                return Response(
+                    {"error": "Audio recording is too short or empty."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
         # Determine languages
         if sender_type == "patient":
             original_lang = room.patient_language
@@ -65,68 +118,98 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
             original_lang = room.doctor_language
             target_lang = room.patient_language
 
+        # Start image analysis now so it overlaps with the RAG query and translation below
+        image_future = _image_executor.submit(self._analyze_image, image_data, target_lang) if image_data else None
+
+        # Voice-only messages take their text from the transcription
+        voice_only = bool(audio_data) and (not text or text == "[Voice Message]")
+
+        # Without Celery, transcribe before the INSERT so a failed recording never creates a row
+        audio_transcription = ""
+        if voice_only and not CELERY_ENABLED:
+            try:
+                audio_transcription, error = self._transcribe(audio_bytes, original_lang)
+            except Exception as e:
+                logger.error("Audio processing failed: %s", e)
+                return Response(
+                    {"error": f"Audio processing failed: {str(e)}"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+            if error is not None:
+                return error
+            text = audio_transcription
+            voice_only = False
+
         # Get conversation history for context
-        recent_messages = room.messages.order_by("-created_at")[:5]
-        history = [
-            {"sender_type": msg.sender_type, "text": msg.original_text} for msg in reversed(list(recent_messages))
-        ]
+        # Newest five via the (room, -created_at) index, reversed into chronological order
+        recent_messages = list(room.messages.order_by("-created_at").values_list("sender_type", "original_text")[:5])
+        history = [{"sender_type": sender, "text": text} for sender, text in reversed(recent_messages)]
 
         # Query RAG for relevant context
         rag_context = self._get_rag_context(room, history, text, sender_type)
 
         # Translate message with RAG context using AI factory
-        try:
-            translator = get_translation_service()
-            translated_text = translator.translate_with_context(
-                text=text,
-                source_lang=original_lang,
-                target_lang=target_lang,
-                conversation_history=history,
-                sender_type=sender_type,
-                rag_context=rag_context,
-            )
-        except Exception as e:
-            return Response({"error": f"Translation failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # Queued voice messages are translated by the worker after transcription
+        translated_text = None
+        if not voice_only:
+            try:
+                translator = get_translation_service()
+                translated_text = translator.translate_with_context(
+                    text=text,
+                    source_lang=original_lang,
+                    target_lang=target_lang,
+                    conversation_history=history,
+                    sender_type=sender_type,
+                    rag_context=rag_context,
+                )
+            except Exception as e:
+                return Response(
+                    {"error": f"Translation failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+
+        # Wait for the image description so it goes into the same INSERT
+        image_description = image_future.result() if image_future else None
 
         # Create message
         message = ChatMessage.objects.create(
             room=room,
             sender_type=sender_type,
-            original_text=text,
+            original_text="[Processing audio...]" if voice_only else text,
             original_language=original_lang,
-            translated_text=translated_text,
+            translated_text="[Processing...]" if voice_only else translated_text,
             translated_language=target_lang,
             has_image=bool(image_data),
+            image_description=image_description,
             has_audio=bool(audio_data),
+            audio_transcription=audio_transcription,
+            # The recording is stored as part of the INSERT rather than attached with a later UPDATE
+            audio_file=ContentFile(audio_bytes, name=f"audio_{uuid4().hex}.webm") if audio_bytes else None,
+            audio_size_bytes=len(audio_bytes) if audio_bytes else None,
         )
 
-        # Publish message created event (for real-time notifications via RabbitMQ)
+        # Publish message created event (for real-time notifications via RabbitMQ).
+        # With Celery the publish and its broker confirm happen on a worker instead of in the request.
         try:
-            from api.events import publish_event
-
-            publish_event(
+            publish = publish_event_async if CELERY_ENABLED else publish_event
+            publish(
                 "message.created",
                 {
                     "message_id": message.id,
                     "room_id": room.id,
                     "sender_type": sender_type,
-                    "text": text[:100],  # Truncate for event
+                    "text": message.original_text[:100],  # Truncate for event
                     "has_audio": bool(audio_data),
                 },
             )
         except Exception as e:
-            logger.warning(f"Failed to publish message.created event: {e}")
+            logger.warning("Failed to publish message.created event: %s", e)
 
-        # Process audio if provided
-        if audio_data:
-            result = self._process_audio(message, audio_data, original_lang, target_lang, history, rag_context)
+        # Queue transcription of voice-only messages
+        if voice_only:
+            result = self._process_audio(message, audio_bytes, original_lang, target_lang, history, rag_context)
             if result is not None:
                 return result
 
-        # Process image if provided
-        if image_data:
-            self._process_image(message, image_data, target_lang)
-
         serializer = ChatMessageSerializer(message)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -136,8 +219,8 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
             return None
 
         try:
-            logger.info(f"RAG collection found: {room.rag_collection.name}")
-            conversation_context = "\n".join([f"{h['sender_type']}: {h['text']}" for h in history])
+            logger.info("RAG collection found: %s", room.rag_collection.name)
+            conversation_context = "\n".join(f"{h['sender_type']}: {h['text']}" for h in history)
 
             rag_query = f"""
 Context: Medical conversation between patient and doctor.
@@ -152,93 +235,112 @@ Current Message: {text}
 
 Provide relevant cultural context, medical information, or language nuances.
 """
-            rag_service = RAGService(room.rag_collection)
-            rag_results = rag_service.query(rag_query, top_k=3)
+            rag_service = get_rag_service(room.rag_collection)
+            query_embedding = rag_service._generate_embedding(rag_query)
+
+            # Consecutive turns produce near-identical queries, reuse their results
+            # Scoped to the collection version so documents added or deleted elsewhere are picked up
+            version = get_collection_version(room.rag_collection)
+            rag_results = rag_query_cache.get(room.rag_collection_id, version, query_embedding)
+            if rag_results is None:
+                rag_results = rag_service.query_by_embedding(query_embedding, top_k=3)
+                rag_query_cache.set(room.rag_collection_id, version, query_embedding, rag_results)
 
             if rag_results:
-                return "\n\n".join([f"Context from {r['name']}: {r['content'][:300]}" for r in rag_results[:2]])
+                return "\n\n".join(f"Context from {r['name']}: {r['content'][:300]}" for r in rag_results[:2])
 
         except Exception as e:
-            logger.error(f"RAG context query failed: {e}", exc_info=True)
+            logger.error("RAG context query failed: %s", e, exc_info=True)
 
         return None
 
-    def _process_audio(self, message, audio_data, original_lang, target_lang, history, rag_context):
-        """Process audio data for a message. Uses Celery if available."""
+    def _decode_audio(self, audio_data):
+        """
+        Return the raw bytes of a multipart upload or base64 string.
+
+        Returns None when the recording is too short to hold speech.
+        """
+        if isinstance(audio_data, UploadedFile):
+            # Sent as multipart/form-data, the bytes arrive as-is with no base64 step
+            if audio_data.size < MIN_AUDIO_BYTES:
+                return None
+            audio_bytes = audio_data.read()
+        else:
+            # Compare the encoded length first so short payloads are rejected without decoding
+            if len(audio_data) < MIN_AUDIO_BASE64_LENGTH:
+                return None
+            audio_bytes = a2b_base64(audio_data)
+
+        logger.info("Received audio: %s bytes", len(audio_bytes))
+
+        if len(audio_bytes) < MIN_AUDIO_BYTES:
+            return None
+        return audio_bytes
+
+    def _transcribe(self, audio_bytes, source_lang):
+        """Transcribe audio. Returns (transcription, None) or (None, error response)."""
+        transcriber = get_transcription_service()
+        result = transcriber.transcribe(audio_bytes, source_lang=source_lang)
+
+        if not result["success"]:
+            return None, Response(
+                {"error": f"Audio transcription failed: {result.get('error')}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        transcription = result["transcription"]
+        if not transcription or len(transcription.strip()) == 0:
+            return None, Response(
+                {"error": "No speech detected in audio."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return transcription, None
+
+    def _process_audio(self, message, audio_bytes, original_lang, target_lang, history, rag_context):
+        """Queue transcription of a stored voice message, transcribing inline if queueing fails."""
         try:
-            audio_bytes = base64.b64decode(audio_data)
-            logger.info(f"Received audio: {len(audio_bytes)} bytes")
+            # Queue async transcription - will also trigger translation
+            current_app.send_task(
+                TRANSCRIBE_AUDIO_TASK,
+                # The worker reads the stored file, so the recording isn't copied through the broker
+                kwargs={
+                    "message_id": message.id,
+                    "source_lang": original_lang,
+                },
+                ignore_result=True,
+            )
+            logger.info("Audio transcription queued for message %s", message.id)
+            # Message will be updated by Celery task
+            return None
+        except Exception as e:
+            logger.warning("Celery task failed, falling back to sync: %s", e)
+            # Fall through to synchronous processing
 
-            if len(audio_bytes) < 500:
+        try:
+            # Synchronous fallback when the task could not be queued
+            transcription, error = self._transcribe(audio_bytes, original_lang)
+            if error is not None:
                 message.delete()
-                return Response(
-                    {"error": "Audio recording is too short or empty."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+                return error
 
-            audio_file = ContentFile(audio_bytes, name=f"audio_{message.id}.webm")
-            message.audio_file = audio_file
-            message.save()
-
-            if not message.original_text or message.original_text == "[Voice Message]":
-                # Try async processing with Celery if available
-                if CELERY_ENABLED:
-                    try:
-                        from api.tasks.audio_tasks import transcribe_audio_async
-
-                        # Queue async transcription - will also trigger translation
-                        transcribe_audio_async.delay(
-                            message_id=message.id,
-                            audio_data=audio_bytes,
-                            source_lang=original_lang,
-                        )
-                        logger.info(f"Audio transcription queued for message {message.id}")
-                        # Return None to indicate async processing started
-                        # Message will be updated by Celery task
-                        message.original_text = "[Processing audio...]"
-                        message.translated_text = "[Processing...]"
-                        message.save()
-                        return None
-                    except Exception as e:
-                        logger.warning(f"Celery task failed, falling back to sync: {e}")
-                        # Fall through to synchronous processing
-
-                # Synchronous processing (fallback or when Celery not available)
-                transcriber = get_transcription_service()
-                result = transcriber.transcribe(audio_bytes, source_lang=original_lang)
-
-                if result["success"]:
-                    transcription = result["transcription"]
-                    if not transcription or len(transcription.strip()) == 0:
-                        message.delete()
-                        return Response(
-                            {"error": "No speech detected in audio."},
-                            status=status.HTTP_400_BAD_REQUEST,
-                        )
-
-                    message.audio_transcription = transcription
-                    message.original_text = transcription
-
-                    translator = get_translation_service()
-                    translated_text = translator.translate_with_context(
-                        text=transcription,
-                        source_lang=original_lang,
-                        target_lang=target_lang,
-                        conversation_history=history,
-                        sender_type=message.sender_type,
-                        rag_context=rag_context,
-                    )
-                    message.translated_text = translated_text
-                    message.save()
-                else:
-                    message.delete()
-                    return Response(
-                        {"error": f"Audio transcription failed: {result.get('error')}"},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
+            message.audio_transcription = transcription
+            message.original_text = transcription
+
+            translator = get_translation_service()
+            translated_text = translator.translate_with_context(
+                text=transcription,
+                source_lang=original_lang,
+                target_lang=target_lang,
+                conversation_history=history,
+                sender_type=message.sender_type,
+                rag_context=rag_context,
+            )
+            message.translated_text = translated_text
+            message.save(update_fields=["audio_transcription", "original_text", "translated_text"])
 
         except Exception as e:
-            logger.error(f"Audio processing failed: {e}")
+            logger.error("Audio processing failed: %s", e)
             message.delete()
             return Response(
                 {"error": f"Audio processing failed: {str(e)}"},
@@ -247,19 +349,16 @@ Provide relevant cultural context, medical information, or language nuances.
 
         return None
 
-    def _process_image(self, message, image_data, target_lang):
-        """Process image data for a message."""
+    def _analyze_image(self, image_data, target_lang):
+        """Return a description of the attached image, or None if analysis fails."""
         try:
-            image_bytes = base64.b64decode(image_data)
+            image_bytes = a2b_base64(image_data)
             # Use Gemini for image analysis (Ollama doesn't support this well)
-            from api.services.gemini_service import get_gemini_service
-
             gemini = get_gemini_service()
             result = gemini.analyze_image(image_bytes, target_lang)
-            message.image_description = result.get("description")
-            message.save()
+            return result.get("description")
         except Exception:
-            pass
+            return None
 
     @action(detail=True, methods=["post"])
     def add_patient_context(self, request, pk=None):
@@ -268,15 +367,16 @@ Provide relevant cultural context, medical information, or language nuances.
 
         collection_id = request.data.get("collection_id")
         if collection_id:
-            try:
-                collection = Collection.objects.get(id=collection_id)
+            # Clients resend the room's current collection, which needs no lookup or UPDATE
+            if str(collection_id) != str(room.rag_collection_id):
+                collection = Collection.objects.filter(id=collection_id).first()
+                if collection is None:
+                    return Response(
+                        {"error": f"Collection with id {collection_id} not found"},
+                        status=status.HTTP_404_NOT_FOUND,
+                    )
                 room.rag_collection = collection
-                room.save()
-            except Collection.DoesNotExist:
-                return Response(
-                    {"error": f"Collection with id {collection_id} not found"},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
+                room.save(update_fields=["rag_collection", "updated_at"])
         elif not room.rag_collection:
             return Response(
                 {"error": "No RAG collection configured. Please provide collection_id"},
@@ -305,22 +405,43 @@ DOCTOR LANGUAGE: {room.doctor_language}
 CHAT ROOM: {room.name}
 """
 
-        try:
-            rag_service = RAGService(room.rag_collection)
-            item = rag_service.add_document(
-                name=f"Patient Profile: {patient_name}",
-                content=document_content,
-                description=f"Comprehensive profile for {patient_name}",
-                metadata={
-                    "type": "patient_profile",
-                    "patient_name": patient_name,
-                    "chat_room_id": room.id,
-                },
-            )
+        document = {
+            "name": f"Patient Profile: {patient_name}",
+            "content": document_content,
+            "description": f"Comprehensive profile for {patient_name}",
+            "metadata": {
+                "type": "patient_profile",
+                "patient_name": patient_name,
+                "chat_room_id": room.id,
+            },
+        }
+
+        if not room.patient_name:
+            room.patient_name = patient_name
+            room.save(update_fields=["patient_name", "updated_at"])
+
+        # Embedding the profile is slow, hand it to a worker when Celery is available
+        if CELERY_ENABLED:
+            try:
+                task = current_app.send_task(
+                    ADD_PATIENT_CONTEXT_TASK,
+                    kwargs={"collection_id": room.rag_collection_id, **document},
+                )
+                return Response(
+                    {
+                        "status": "processing",
+                        "message": "Patient context is being added",
+                        "task_id": task.id,
+                    },
+                    status=status.HTTP_202_ACCEPTED,
+                )
+            except Exception as e:
+                logger.warning("Celery task failed, falling back to sync: %s", e)
+                # Fall through to synchronous processing
 
-            if not room.patient_name:
-                room.patient_name = patient_name
-                room.save()
+        try:
+            rag_service = get_rag_service(room.rag_collection)
+            item = rag_service.add_document(**document)
 
             return Response(
                 {"status": "success", "message": "Patient context added", "document_id": item.id},
@@ -349,9 +470,10 @@ CHAT ROOM: {room.name}
         # Async mode - queue task and return immediately
         if async_mode and CELERY_ENABLED:
             try:
-                from api.tasks.assistance_tasks import generate_doctor_assistance_async
-
-                task = generate_doctor_assistance_async.delay(room_id=room.id, request_type=request_type)
+                task = current_app.send_task(
+                    DOCTOR_ASSISTANCE_TASK,
+                    kwargs={"room_id": room.id, "request_type": request_type},
+                )
                 return Response(
                     {
                         "status": "processing",
@@ -361,15 +483,24 @@ CHAT ROOM: {room.name}
                     status=status.HTTP_202_ACCEPTED,
                 )
             except Exception as e:
-                logger.warning(f"Celery task failed, falling back to sync: {e}")
+                logger.warning("Celery task failed, falling back to sync: %s", e)
                 # Fall through to synchronous processing
 
         # Synchronous processing
-        recent_messages = room.messages.order_by("-created_at")[:10]
-        conversation_context = "\n".join(
-            [f"{msg.sender_type}: {msg.original_text}" for msg in reversed(list(recent_messages))]
+        recent_messages = list(
+            room.messages.order_by("-created_at").values_list("id", "sender_type", "original_text")[:10]
         )
 
+        # Any new message changes the key, so cached answers never go stale
+        last_message_id = recent_messages[0][0] if recent_messages else 0
+        recent_messages.reverse()
+        cache_key = f"assist:{room.id}:{last_message_id}:{room.rag_collection_id}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Response(cached, status=status.HTTP_200_OK)
+
+        conversation_context = "\n".join(f"{sender}: {text}" for _, sender, text in recent_messages)
+
         assistance_query = f"""
 Based on this medical conversation, provide assistance to the doctor:
 
@@ -387,14 +518,15 @@ Please suggest:
 """
 
         try:
-            rag_service = RAGService(room.rag_collection)
+            rag_service = get_rag_service(room.rag_collection)
             result = rag_service.query_and_answer(assistance_query, top_k=5)
 
             if result["status"] == "success":
-                return Response(
-                    {"status": "success", "assistance": result["answer"], "sources": result.get("sources", [])},
-                    status=status.HTTP_200_OK,
-                )
+                payload = {"status": "success", "assistance": result["answer"], "sources": result.get("sources", [])}
+                # Provider failures come back as an answer text, don't serve them from the cache
+                if not result["answer"].startswith("Error generating answer"):
+                    cache.set(cache_key, payload, timeout=settings.CACHE_TIMEOUTS["doctor_assistance"])
+                return Response(payload, status=status.HTTP_200_OK)
             else:
                 return Response(
                     {"status": "error", "message": result.get("message", "Failed to generate assistance")},
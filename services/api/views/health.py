@@ -1,18 +1,41 @@
 from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag, require_safe
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+from celery import current_app, states
 
-@api_view(["GET"])
+# Health payload never changes, so it is serialised once at import
+HEALTH_CHECK_BODY = b'{"status":"ok","message":"pong"}'
+HEALTH_CHECK_ETAG = '"pong-v1"'
+
+# Check if Celery is available for async processing
+CELERY_ENABLED = getattr(settings, "CELERY_BROKER_URL", None) is not None
+
+# Broker host and port only, credentials in the URL are never returned
+BROKER_HOST = settings.CELERY_BROKER_URL.split("@")[-1] if CELERY_ENABLED and settings.CELERY_BROKER_URL else None
+
+# Seconds celery_status waits for workers to answer the inspect broadcast
+CELERY_INSPECT_TIMEOUT = 0.5
+
+
+@cache_control(public=True, max_age=5)
+@require_safe
+@etag(lambda request: HEALTH_CHECK_ETAG)
 def health_check(request):
     """
     Health check endpoint to verify the API is running.
 
+    Plain Django view so load balancer probes skip DRF negotiation and rendering.
+
     Returns:
         200 OK with a ping response
     """
-    return Response({"status": "ok", "message": "pong"}, status=status.HTTP_200_OK)
+    return HttpResponse(HEALTH_CHECK_BODY, content_type="application/json")
 
 
 @api_view(["GET"])
@@ -26,30 +49,38 @@ def task_status(request, task_id):
     Returns:
         Task status and result if available
     """
-    celery_enabled = getattr(settings, "CELERY_BROKER_URL", None) is not None
-
-    if not celery_enabled:
+    if not CELERY_ENABLED:
         return Response(
             {"error": "Celery is not configured"},
             status=status.HTTP_503_SERVICE_UNAVAILABLE,
         )
 
-    try:
-        from celery.result import AsyncResult
+    cache_key = f"task_status:{task_id}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return Response(cached, status=status.HTTP_200_OK)
 
-        result = AsyncResult(task_id)
+    try:
+        # One lookup of the stored task meta, nothing here waits or polls for the result
+        meta = current_app.backend.get_task_meta(task_id)
+        task_state = meta["status"]
+        ready = task_state in states.READY_STATES
 
         response_data = {
             "task_id": task_id,
-            "status": result.status,
-            "ready": result.ready(),
+            "status": task_state,
+            "ready": ready,
         }
 
-        if result.ready():
-            if result.successful():
-                response_data["result"] = result.result
+        if ready:
+            if task_state == states.SUCCESS:
+                response_data["result"] = meta["result"]
             else:
-                response_data["error"] = str(result.result)
+                response_data["error"] = str(meta["result"])
+
+        # Finished tasks never change, pending ones are only cached long enough to absorb polling
+        timeout_key = "task_result" if ready else "task_status"
+        cache.set(cache_key, response_data, timeout=settings.CACHE_TIMEOUTS[timeout_key])
 
         return Response(response_data, status=status.HTTP_200_OK)
 
@@ -65,9 +96,7 @@ def celery_status(request):
     Returns:
         Celery status information
     """
-    celery_enabled = getattr(settings, "CELERY_BROKER_URL", None) is not None
-
-    if not celery_enabled:
+    if not CELERY_ENABLED:
         return Response(
             {
                 "celery_enabled": False,
@@ -77,18 +106,14 @@ def celery_status(request):
         )
 
     try:
-        from config.celery import app
-
-        # Try to ping workers
-        inspect = app.control.inspect()
-        active_workers = inspect.active()
+        # Inspecting broadcasts to every worker and waits for replies, so share the answer briefly
+        def _active_worker_names():
+            return list((current_app.control.inspect(timeout=CELERY_INSPECT_TIMEOUT).active() or {}).keys())
 
-        if active_workers:
-            worker_count = len(active_workers)
-            worker_names = list(active_workers.keys())
-        else:
-            worker_count = 0
-            worker_names = []
+        worker_names = cache.get_or_set(
+            "celery_active_workers", _active_worker_names, timeout=settings.CACHE_TIMEOUTS["celery_workers"]
+        )
+        worker_count = len(worker_names)
 
         return Response(
             {
@@ -96,7 +121,7 @@ def celery_status(request):
                 "workers_available": worker_count > 0,
                 "worker_count": worker_count,
                 "worker_names": worker_names,
-                "broker_url": settings.CELERY_BROKER_URL.split("@")[-1] if settings.CELERY_BROKER_URL else None,
+                "broker_url": BROKER_HOST,
             },
             status=status.HTTP_200_OK,
         )
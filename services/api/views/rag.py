@@ -1,19 +1,36 @@
+import hashlib
 import logging
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from api.models import Collection, CollectionItem
 from api.serializers import CollectionItemSerializer, CollectionSerializer, RAGQuerySerializer
-from api.services.rag_service import RAGService
+from api.services.rag_service import get_collection_version, get_rag_service
+from api.tasks.rag_tasks import process_document_async, reindex_collection
+from api.utils import cache_timeout
 
 logger = logging.getLogger(__name__)
 
 # Check if Celery is available for async processing
 CELERY_ENABLED = getattr(settings, "CELERY_BROKER_URL", None) is not None
 
+# Values accepted as "on" for boolean flags sent as strings (form data, query params)
+_TRUTHY = frozenset({"true", "1", "yes", "on", "t", "y"})
+
+
+def _as_bool(value, default: bool = False) -> bool:
+    """Interpret a request flag that may arrive as a JSON bool or a string."""
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return default
+    return str(value).strip().lower() in _TRUTHY
+
 
 class CollectionViewSet(viewsets.ModelViewSet):
     """ViewSet for managing RAG collections."""
@@ -21,6 +38,14 @@ class CollectionViewSet(viewsets.ModelViewSet):
     queryset = Collection.objects.all()
     serializer_class = CollectionSerializer
 
+    def get_queryset(self):
+        """Count each collection's items in the same query for the serializer and reindex."""
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve", "reindex"):
+            # Meta.ordering is left out of GROUP BY queries, so the newest-first order is restated
+            queryset = queryset.annotate(items_total=Count("items")).order_by(*Collection._meta.ordering)
+        return queryset
+
     @action(detail=True, methods=["post"])
     def add_document(self, request, pk=None):
         """Add a document to the collection. Uses Celery for async embedding generation if available."""
@@ -30,7 +55,7 @@ class CollectionViewSet(viewsets.ModelViewSet):
         content = request.data.get("content")
         description = request.data.get("description", "")
         metadata = request.data.get("metadata", {})
-        async_mode = request.data.get("async", False)
+        async_mode = _as_bool(request.data.get("async"))
 
         if not name or not content:
             return Response({"error": "Name and content are required"}, status=status.HTTP_400_BAD_REQUEST)
@@ -48,8 +73,6 @@ class CollectionViewSet(viewsets.ModelViewSet):
                 )
 
                 # Queue embedding generation
-                from api.tasks.rag_tasks import process_document_async
-
                 process_document_async.delay(document_id=item.id)
 
                 serializer = CollectionItemSerializer(item)
@@ -63,7 +86,7 @@ class CollectionViewSet(viewsets.ModelViewSet):
                 )
 
             # Synchronous processing (default)
-            rag_service = RAGService(collection)
+            rag_service = get_rag_service(collection)
             item = rag_service.add_document(name=name, content=content, description=description, metadata=metadata)
 
             serializer = CollectionItemSerializer(item)
@@ -85,7 +108,7 @@ class CollectionViewSet(viewsets.ModelViewSet):
         top_k = serializer.validated_data.get("top_k", 5)
 
         try:
-            rag_service = RAGService(collection)
+            rag_service = get_rag_service(collection)
             results = rag_service.query(query_text, top_k=top_k)
 
             return Response(
@@ -119,10 +142,25 @@ class CollectionViewSet(viewsets.ModelViewSet):
         query_text = serializer.validated_data["query"]
         top_k = serializer.validated_data.get("top_k", 5)
 
+        # Answers depend on the collection settings and its items, so any change to either gives a new key
+        updated_at, total, last_updated = get_collection_version(collection)
+        query_hash = hashlib.blake2b(query_text.encode(), digest_size=16).hexdigest()
+        cache_key = (
+            f"rag:qa:{collection.id}:{updated_at.timestamp()}:{total}:"
+            f"{last_updated.timestamp() if last_updated else 0}:{top_k}:{query_hash}"
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Response(cached, status=status.HTTP_200_OK)
+
         try:
-            rag_service = RAGService(collection)
+            rag_service = get_rag_service(collection)
             result = rag_service.query_and_answer(query_text, top_k=top_k)
 
+            # generate_answer reports provider failures inside the answer text, those are not cached
+            if result["status"] == "success" and not result["answer"].startswith("Error generating answer"):
+                cache.set(cache_key, result, timeout=cache_timeout("rag_answer"))
+
             return Response(result, status=status.HTTP_200_OK)
         except Exception as e:
             logger.error(f"Error in query_and_answer: {e}")
@@ -140,15 +178,13 @@ class CollectionViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            from api.tasks.rag_tasks import reindex_collection
-
             task = reindex_collection.delay(collection_id=collection.id)
             return Response(
                 {
                     "status": "processing",
                     "message": f"Reindexing started for collection '{collection.name}'",
                     "task_id": task.id,
-                    "document_count": collection.items.count(),
+                    "document_count": collection.items_total,
                 },
                 status=status.HTTP_202_ACCEPTED,
             )
@@ -165,7 +201,8 @@ class CollectionItemViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter items by collection if specified."""
-        queryset = super().get_queryset()
+        # The serializer never returns the embedding vector, so leave it in the database
+        queryset = super().get_queryset().select_related("collection").defer("embedding")
         collection_id = self.request.query_params.get("collection")
         if collection_id:
             queryset = queryset.filter(collection_id=collection_id)
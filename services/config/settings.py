@@ -1,7 +1,7 @@
 from pathlib import Path
 
 import dj_database_url
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -9,7 +9,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Security settings
 SECRET_KEY = config("SECRET_KEY", default="django-insecure-dev-key-change-in-production")
 DEBUG = config("DEBUG", default=True, cast=bool)
-ALLOWED_HOSTS = config("ALLOWED_HOSTS", default="localhost,127.0.0.1").split(",")
+ALLOWED_HOSTS = config("ALLOWED_HOSTS", default="localhost,127.0.0.1", cast=Csv(post_process=tuple))
 
 # Application definition
 INSTALLED_APPS = [
@@ -72,8 +72,16 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 # Database
 DATABASES = {
-    "default": dj_database_url.config(default=config("DATABASE_URL", default="sqlite:///db.sqlite3"), conn_max_age=600)
+    "default": dj_database_url.config(
+        default=config("DATABASE_URL", default="sqlite:///db.sqlite3"),
+        conn_max_age=config("DB_CONN_MAX_AGE", default=600, cast=int),
+    )
 }
+# Required when DATABASE_URL points at PgBouncer in transaction pooling mode,
+# where a server-side cursor can't outlive the transaction that opened it
+DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = config(
+    "DB_DISABLE_SERVER_SIDE_CURSORS", default=False, cast=bool
+)
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -107,10 +115,9 @@ AUTH_USER_MODEL = "api.User"
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 100,
-    "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
-        "rest_framework.renderers.BrowsableAPIRenderer",
-    ],
+    # The browsable API is a development aid, production only renders JSON
+    "DEFAULT_RENDERER_CLASSES": ["api.renderers.ORJSONRenderer"]
+    + (["rest_framework.renderers.BrowsableAPIRenderer"] if DEBUG else []),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
@@ -121,11 +128,15 @@ REST_FRAMEWORK = {
 }
 
 # CORS settings
-CORS_ALLOWED_ORIGINS = config("CORS_ALLOWED_ORIGINS", default="http://localhost:5173,http://127.0.0.1:5173").split(",")
+CORS_ALLOWED_ORIGINS = config(
+    "CORS_ALLOWED_ORIGINS", default="http://localhost:5173,http://127.0.0.1:5173", cast=Csv(post_process=tuple)
+)
 CORS_ALLOW_CREDENTIALS = True
 
 # Session settings (for cookie-based auth)
-SESSION_ENGINE = "django.contrib.sessions.backends.db"
+# Sessions are read from Redis and only fall back to the database on a cache miss
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_CACHE_ALIAS = "sessions"
 SESSION_COOKIE_AGE = 86400 * 7  # 7 days
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SECURE = not DEBUG  # HTTPS only in production
@@ -133,8 +144,10 @@ SESSION_COOKIE_SAMESITE = "Lax"
 CSRF_COOKIE_SECURE = not DEBUG
 CSRF_COOKIE_SAMESITE = "Lax"
 CSRF_TRUSTED_ORIGINS = config(
-    "CSRF_TRUSTED_ORIGINS", default="http://localhost:5173,http://127.0.0.1:5173,http://localhost:3000"
-).split(",")
+    "CSRF_TRUSTED_ORIGINS",
+    default="http://localhost:5173,http://127.0.0.1:5173,http://localhost:3000",
+    cast=Csv(post_process=tuple),
+)
 
 # Two-Factor Authentication Settings
 LOGIN_URL = "two_factor:login"
@@ -157,23 +170,63 @@ GEMINI_API_KEY = config("GEMINI_API_KEY", default="")
 # Used for: Translation cache, RAG query cache, session storage
 REDIS_URL = config("REDIS_URL", default="redis://localhost:6379/1")
 
+# Options for the redis-py connection pool each process keeps per cache
+REDIS_CACHE_OPTIONS = {
+    "max_connections": 50,
+    "socket_keepalive": True,
+    "socket_connect_timeout": 1,
+    "socket_timeout": 1,
+    "retry_on_timeout": True,
+    "health_check_interval": 30,
+}
+
+# Bumping CACHE_VERSION makes every cached result unreachable at once, Redis evicts the old keys on its own
+CACHE_VERSION = config("CACHE_VERSION", default=1, cast=int)
+
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.redis.RedisCache",
         "LOCATION": REDIS_URL,
         "KEY_PREFIX": "medical_translation",
+        "VERSION": CACHE_VERSION,
         "TIMEOUT": 300,  # 5 minutes default
-    }
+        "OPTIONS": REDIS_CACHE_OPTIONS,
+    },
+    # Own alias so sessions can live in a separate Redis database (SESSION_REDIS_URL) from cached results
+    "sessions": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("SESSION_REDIS_URL", default=REDIS_URL),
+        "KEY_PREFIX": "medical_translation_sessions",
+        "TIMEOUT": SESSION_COOKIE_AGE,
+        "OPTIONS": REDIS_CACHE_OPTIONS,
+    },
+    # Small per-process copy of hot translation entries in front of Redis (see api.utils.get_tiered)
+    "l1": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "medical_translation_l1",
+        "VERSION": CACHE_VERSION,
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    },
 }
 
 # Cache timeouts for different data types
 CACHE_TIMEOUTS = {
     "translation": 3600,  # 1 hour for translations
     "rag_query": 1800,  # 30 minutes for RAG results
+    "transcription": 3600,  # 1 hour for audio transcriptions
+    "rag_answer": 600,  # 10 minutes for generated RAG answers
     "user_session": 86400,  # 24 hours for sessions
     "cultural_tips": 86400,  # 24 hours for cultural tips
+    "doctor_assistance": 60,  # 1 minute for repeated assistance requests
+    "task_status": 2,  # 2 seconds for pending task polls
+    "task_result": 300,  # 5 minutes for finished task results
+    "celery_workers": 5,  # 5 seconds for the active worker list
 }
 
+# Long-lived entries get their timeout spread by up to this fraction (see api.utils.cache_timeout)
+CACHE_TIMEOUT_JITTER = 0.1
+
 
 # Celery Configuration
 
@@ -193,6 +246,8 @@ CELERY_ENABLE_UTC = True
 
 # Task settings
 CELERY_TASK_TRACK_STARTED = True
+# Default for long jobs (transcription, embeddings, dataset imports), chat-facing
+# translation and assistance tasks set their own limits of a couple of minutes
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes max per task
 CELERY_TASK_SOFT_TIME_LIMIT = 25 * 60  # Soft limit at 25 minutes
 
@@ -210,8 +265,18 @@ CELERY_TASK_DEFAULT_QUEUE = "default"
 
 # Retry settings
 CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True  # Requeue tasks whose worker process died mid-run
 CELERY_WORKER_PREFETCH_MULTIPLIER = 1
 
+# Recycle pool processes periodically so memory held by AI client libraries is released
+CELERY_WORKER_MAX_TASKS_PER_CHILD = config("CELERY_WORKER_MAX_TASKS_PER_CHILD", default=100, cast=int)
+
+# Task results are only read by the task status endpoint shortly after completion
+CELERY_RESULT_EXPIRES = 3600  # 1 hour
+
+# Worker pool size, overridable per deployment (unset = number of CPUs)
+CELERY_WORKER_CONCURRENCY = config("CELERY_WORKER_CONCURRENCY", default=0, cast=int) or None
+
 # Beat schedule for periodic tasks
 CELERY_BEAT_SCHEDULE = {
     "cleanup-old-audio-daily": {
@@ -304,23 +369,23 @@ LOGGING = {
     "loggers": {
         "api": {
             "handlers": ["console"],
-            "level": "DEBUG",
+            "level": "DEBUG" if DEBUG else "INFO",
             "propagate": False,
         },
         "celery": {
             "handlers": ["console"],
             "level": "INFO",
-            "propagate": True,
+            "propagate": False,
         },
         "celery.task": {
             "handlers": ["console"],
             "level": "INFO",
-            "propagate": True,
+            "propagate": False,
         },
         "celery.worker": {
             "handlers": ["console"],
             "level": "INFO",
-            "propagate": True,
+            "propagate": False,
         },
     },
 }
@@ -24,14 +24,18 @@ schema_view = get_schema_view(
     permission_classes=(permissions.AllowAny,),
 )
 
+# Generating the schema walks every view, so outside development it is built once an hour
+SCHEMA_CACHE_TIMEOUT = 0 if settings.DEBUG else 3600
+
+# The API takes almost all of the traffic, so its prefix is tried first
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("api/", include("api.urls")),
+    path("admin/", admin.site.urls),
     # Two-Factor Authentication URLs
     path("", include(tf_urls)),
     # API Documentation
-    path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
-    path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
+    path("swagger/", schema_view.with_ui("swagger", cache_timeout=SCHEMA_CACHE_TIMEOUT), name="schema-swagger-ui"),
+    path("redoc/", schema_view.with_ui("redoc", cache_timeout=SCHEMA_CACHE_TIMEOUT), name="schema-redoc"),
 ]
 
 # Serve media files in development